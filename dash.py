@@ -17,10 +17,156 @@ csv_path = os.path.join(current_dir, 'dados_apartamentos_limpos.csv')
 # Carregar dados
 @st.cache_data
 def load_data():
-    return pd.read_csv(csv_path, sep=';', encoding='utf-8')
+    df = pd.read_csv(
+        csv_path, sep=';', encoding='utf-8', engine='c',
+        # Vagas tem valores acima de 127; Area é sempre inteira (em m²)
+        dtype={'Quartos': 'int8', 'Vagas': 'int16', 'Suites': 'int8', 'Area': 'int16'}
+    )
+    # Colunas usadas em filtros/agrupamentos como categorias (códigos inteiros)
+    for c in ('Bairro', 'Quartos', 'Vagas', 'Suites'):
+        df[c] = df[c].astype('category')
+    return df
 
 df = load_data()
 
+# Opções dos filtros (estáticas durante a sessão)
+@st.cache_data
+def get_filter_options():
+    return dict(
+        bairros=sorted(df['Bairro'].unique().tolist()),
+        quartos=sorted(df['Quartos'].unique().tolist()),
+        vagas=sorted(df['Vagas'].unique().tolist()),
+        vmin=float(df['Valor'].min()),
+        vmax=float(df['Valor'].max())
+    )
+
+opcoes = get_filter_options()
+
+# Função para formatar valores em Real (troca ',' <-> '.' em uma única passada)
+TABELA_BRL = str.maketrans({',': '.', '.': ','})
+
+def format_brl(valor):
+    if pd.isna(valor):
+        return 'R$ 0,00'
+    return 'R$ ' + f'{valor:,.2f}'.translate(TABELA_BRL)
+
+# Média por grupo a partir dos códigos inteiros de uma categoria (soma e contagem em uma passada)
+def group_mean(codes, values, n_groups):
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    counts = np.bincount(codes, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+# Colunas e número de linhas por página da tabela de dados detalhados
+COLUNAS_DETALHE = ['Bairro', 'Quartos', 'Vagas', 'Area', 'Valor', 'Condominio', 'Valor_por_mes']
+LINHAS_POR_PAGINA = 50
+
+# Chave de conteúdo dos dados de um gráfico (valores e rótulos), usada para pular atualizações repetidas
+def chave_conteudo(dados):
+    if isinstance(dados, (pd.Series, pd.DataFrame)):
+        return pd.util.hash_pandas_object(dados).to_numpy().tobytes()
+    return np.asarray(dados, dtype=float).tobytes()
+
+# Limites (fechados à direita) e rótulos das faixas de tamanho e de preço, montados uma única vez
+BINS_TAMANHO = np.array([0, 50, 70, 90, 120, np.inf])
+LABELS_TAMANHO = ['Até 50m²', '51-70m²', '71-90m²', '91-120m²', 'Acima de 120m²']
+BINS_PRECO = np.array([0, 1000, 2000, 3000, 4000, 5000, np.inf])
+LABELS_PRECO = ['Até R$1.000', 'R$1.001-2.000', 'R$2.001-3.000', 'R$3.001-4.000', 'R$4.001-5.000', 'Acima de R$5.000']
+
+# Classificar valores em faixas fechadas à direita (como pd.cut) via busca binária
+def bucketize(values, bins, labels):
+    codes = np.searchsorted(bins, values, side='left') - 1
+    codes[codes >= len(labels)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+# Aplicar filtros e calcular as agregações dos gráficos (em cache por combinação de filtros)
+@st.cache_data(max_entries=50)
+def compute_filtered(bairros, quartos, vagas, possui_suite, min_valor, max_valor):
+    # Montar uma única máscara booleana e indexar o DataFrame uma só vez
+    valores = df['Valor'].to_numpy()
+    mask = np.ones(len(df), dtype=bool)
+    mask &= valores >= min_valor
+    mask &= valores <= max_valor
+
+    if bairros:
+        mask &= df['Bairro'].isin(bairros).to_numpy()
+
+    if quartos:
+        mask &= df['Quartos'].isin(quartos).to_numpy()
+
+    if possui_suite != 'Todos':
+        mask &= df['Suites'].to_numpy() == (1 if possui_suite == 'Sim' else 0)
+
+    if vagas:
+        mask &= df['Vagas'].isin(vagas).to_numpy()
+
+    linhas = np.flatnonzero(mask)
+
+    if len(linhas) == 0:
+        return linhas, linhas, None, None, None, None, None, None, None
+
+    df_filtered = df.iloc[linhas]
+    valores_filtrados = df_filtered['Valor'].to_numpy()
+
+    # Posições das linhas ordenadas por aluguel (argsort estável), para a tabela detalhada
+    ordem = linhas[np.argsort(valores_filtrados, kind='stable')]
+
+    # Métricas dos KPIs, já formatadas para exibição
+    area_total = df_filtered['Area'].sum()
+    kpis = (
+        format_brl(df_filtered['Valor'].mean()),
+        format_brl(df_filtered['Valor_por_mes'].mean()),
+        format_brl((df_filtered['Valor'].sum() / area_total) if area_total > 0 else 0),
+        f"{len(df_filtered):,.0f}".replace('.', ',')
+    )
+
+    # Ranking de bairros (Top 10)
+    bairros_media = None
+    if len(df_filtered['Bairro'].unique()) > 1:
+        bairro = df_filtered['Bairro'].cat
+        bairros_media = pd.Series(
+            group_mean(bairro.codes.to_numpy(), valores_filtrados, len(bairro.categories)),
+            index=bairro.categories.rename('Bairro'),
+            name='Valor'
+        ).dropna().sort_values().tail(10)
+
+    # Criar categorias de tamanho
+    # (séries locais em vez de novas colunas, para não alterar df_filtered)
+    faixa_tamanho = pd.Series(
+        bucketize(df_filtered['Area'].to_numpy(), BINS_TAMANHO, LABELS_TAMANHO),
+        index=df_filtered.index,
+        name='Faixa de Tamanho'
+    )
+
+    # Calcular médias e contagem por faixa de tamanho
+    # (uma única passada; faixas vazias ficam na contagem e saem do gráfico)
+    g = df_filtered.groupby(faixa_tamanho, observed=False)['Valor'].agg(['mean', 'count'])
+    media_por_tamanho = g.loc[g['count'] > 0, 'mean'].rename('Valor').reset_index()
+    contagem_por_tamanho = g['count']
+
+    # Criar faixas de preço
+    faixa_preco = pd.Series(bucketize(valores_filtrados, BINS_PRECO, LABELS_PRECO), name='Faixa_Preco')
+    contagem = faixa_preco.value_counts().sort_index()
+
+    # Médias com/sem suíte: somas e contagens por número de suítes em uma única passada
+    # (as contagens também dizem se há mais de um valor de Suites entre os filtrados)
+    suites = df_filtered['Suites'].to_numpy()
+    somas = np.bincount(suites, weights=valores_filtrados, minlength=2)
+    contagens = np.bincount(suites, minlength=2)
+    media_com_suite = media_sem_suite = None
+    if np.count_nonzero(contagens) > 1:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media_com_suite = somas[1] / contagens[1]
+            media_sem_suite = somas[0] / contagens[0]
+
+    return (linhas, ordem, kpis, bairros_media, media_por_tamanho, contagem_por_tamanho,
+            contagem, media_com_suite, media_sem_suite)
+
+# Gerar o CSV para download (em cache por combinação de filtros)
+@st.cache_data(max_entries=10, show_spinner=False)
+def to_csv_bytes(filtros, _linhas):
+    return df.iloc[_linhas].to_csv(index=False, sep=';', decimal=',').encode('utf-8')
+
 # Título e descrição
 st.title('🏠 Análise de Mercado Imobiliário')
 st.markdown("""
@@ -34,17 +180,13 @@ st.sidebar.header('Filtros')
 # Filtro de Bairros
 bairros = st.sidebar.multiselect(
     'Selecione os Bairros',
-    options=sorted(df['Bairro'].unique()),
+    options=opcoes['bairros'],
     default=[]
 )
 
-# Função para formatar valores em Real
-def format_brl(valor):
-    return f'R$ {valor:,.2f}'.replace(',', 'X').replace('.', ',').replace('X', '.')
-
 # Filtro de Faixa de Preço
 st.sidebar.markdown('**Faixa de Preço (R$)**')
-min_val, max_val = float(df['Valor'].min()), float(df['Valor'].max())
+min_val, max_val = opcoes['vmin'], opcoes['vmax']
 
 # Criar colunas para os campos de entrada
 col1, col2 = st.sidebar.columns(2)
@@ -53,8 +195,8 @@ with col1:
     min_valor = st.number_input(
         'Mínimo',
         min_value=0.0,
-        max_value=float(df['Valor'].max()),
-        value=float(df['Valor'].min()),
+        max_value=max_val,
+        value=min_val,
         step=100.0
     )
 
@@ -62,8 +204,8 @@ with col2:
     max_valor = st.number_input(
         'Máximo',
         min_value=0.0,
-        max_value=float(df['Valor'].max()),
-        value=float(df['Valor'].max()),
+        max_value=max_val,
+        value=max_val,
         step=100.0
     )
 
@@ -77,8 +219,8 @@ st.sidebar.markdown("---")
 # Filtro de Número de Quartos
 quartos = st.sidebar.multiselect(
     'Nº de Quartos',
-    options=sorted(df['Quartos'].unique()),
-    default=sorted(df['Quartos'].unique())
+    options=opcoes['quartos'],
+    default=opcoes['quartos']
 )
 
 # Filtro de Suíte (usando a coluna 'Suites' que contém 0 ou 1)
@@ -91,153 +233,148 @@ possui_suite = st.sidebar.radio(
 # Filtro de Vagas de Garagem
 vagas = st.sidebar.multiselect(
     'Vagas de Garagem',
-    options=sorted(df['Vagas'].unique()),
-    default=sorted(df['Vagas'].unique())
+    options=opcoes['vagas'],
+    default=opcoes['vagas']
 )
 
-# Aplicar filtros
-df_filtered = df.copy()
-
-if bairros:
-    df_filtered = df_filtered[df_filtered['Bairro'].isin(bairros)]
-
-if quartos:
-    df_filtered = df_filtered[df_filtered['Quartos'].isin(quartos)]
-
-if possui_suite != 'Todos':
-    df_filtered = df_filtered[df_filtered['Suites'] == (1 if possui_suite == 'Sim' else 0)]
-
-if vagas:
-    df_filtered = df_filtered[df_filtered['Vagas'].isin(vagas)]
-
-df_filtered = df_filtered[
-    (df_filtered['Valor'] >= min_valor) & 
-    (df_filtered['Valor'] <= max_valor)
-]
+filtros = (
+    tuple(sorted(bairros)), tuple(sorted(quartos)), tuple(sorted(vagas)),
+    possui_suite, min_valor, max_valor
+)
+(linhas, ordem, kpis, bairros_media, media_por_tamanho, contagem_por_tamanho,
+ contagem, media_com_suite, media_sem_suite) = compute_filtered(*filtros)
 
 # ===== KPI CARDS =====
 st.markdown('---')
 st.subheader('Visão Geral')
 
-if not df_filtered.empty:
-    # Calcular métricas
-    media_aluguel = df_filtered['Valor'].mean()
-    media_custo_mensal = df_filtered['Valor_por_mes'].mean()
-    preco_medio_m2 = (df_filtered['Valor'].sum() / df_filtered['Area'].sum()) if df_filtered['Area'].sum() > 0 else 0
-    total_ofertas = len(df_filtered)
-    
-    # Função para formatar valores em Real
-    def format_brl(valor):
-        if pd.isna(valor):
-            return 'R$ 0,00'
-        return f'R$ {valor:,.2f}'.replace(',', 'X').replace('.', ',').replace('X', '.')
+if len(linhas) > 0:
+    # Métricas calculadas e formatadas em compute_filtered
+    texto_aluguel, texto_custo_mensal, texto_m2, texto_ofertas = kpis
+    total_ofertas = len(linhas)
     
     # Exibir KPIs
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Média de Aluguel", format_brl(media_aluguel))
+        st.metric("Média de Aluguel", texto_aluguel)
     with col2:
-        st.metric("Custo Mensal Médio", format_brl(media_custo_mensal))
+        st.metric("Custo Mensal Médio", texto_custo_mensal)
     with col3:
-        st.metric("Preço Médio por m²", format_brl(preco_medio_m2))
+        st.metric("Preço Médio por m²", texto_m2)
     with col4:
-        st.metric("Total de Ofertas", f"{total_ofertas:,.0f}".replace('.', ','))
+        st.metric("Total de Ofertas", texto_ofertas)
 
     # ===== VISUALIZAÇÕES =====
     st.markdown('---')
     
+    # Esqueletos das figuras criados uma vez por sessão; nos reruns só os dados das barras são atualizados
+    figuras = st.session_state.setdefault('figuras', {})
+    chaves = st.session_state.setdefault('chaves_figuras', {})
+    
     # Gráfico 1: Ranking de Bairros (Simplificado)
     st.subheader('Média de Aluguel por Bairro')
-    if len(df_filtered['Bairro'].unique()) > 1:
-        bairros_media = df_filtered.groupby('Bairro')['Valor'].mean().sort_values().tail(10)  # Top 10 bairros
-        
-        # Criar formatação personalizada para os textos das barras
-        text_values = [f'R$ {x:,.2f}'.replace('.', 'X').replace(',', '.').replace('X', ',') 
-                      for x in bairros_media.values]
+    if bairros_media is not None:
+        # Só atualizar os dados da figura quando o conteúdo muda
+        chave = chave_conteudo(bairros_media)
+        if chaves.get('fig1') != chave:
+            # Criar formatação personalizada para os textos das barras
+            text_values = [format_brl(x) for x in bairros_media.values]
+            
+            if 'fig1' not in figuras:
+                fig1 = px.bar(
+                    bairros_media, 
+                    orientation='h',
+                    color=bairros_media.values,
+                    color_continuous_scale='blues',
+                    labels={'value': 'Média de Aluguel (R$)', 'index': 'Bairro'},
+                    text=text_values
+                )
+                
+                # Melhorar formatação
+                fig1.update_layout(
+                    showlegend=False,
+                    yaxis_title='',
+                    xaxis_title='Média de Aluguel',
+                    height=400,
+                    transition_duration=0
+                )
+                
+                # Formatar eixo X no padrão monetário brasileiro
+                fig1.update_xaxes(
+                    tickprefix='R$ ',
+                    tickformat='.,2f'
+                )
+                figuras['fig1'] = fig1
+            
+            # Atualizar os dados das barras
+            fig1 = figuras['fig1']
+            fig1.update_traces(
+                x=bairros_media.values,
+                y=bairros_media.index,
+                text=text_values,
+                marker_color=bairros_media.values
+            )
+            fig1.update_xaxes(ticktext=text_values)
+            
+            chaves['fig1'] = chave
         
-        fig1 = px.bar(
-            bairros_media, 
-            orientation='h',
-            color=bairros_media.values,
-            color_continuous_scale='blues',
-            labels={'value': 'Média de Aluguel (R$)', 'index': 'Bairro'},
-            text=text_values
-        )
-        
-        # Melhorar formatação
-        fig1.update_layout(
-            showlegend=False,
-            yaxis_title='',
-            xaxis_title='Média de Aluguel',
-            height=400
-        )
-        
-        # Formatar eixo X no padrão monetário brasileiro
-        fig1.update_xaxes(
-            tickprefix='R$ ',
-            tickformat='.,2f',
-            ticktext=[f'R$ {x:,.2f}'.replace('.', 'X').replace(',', '.').replace('X', ',') 
-                     for x in bairros_media.values]
-        )
-        
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(figuras['fig1'], use_container_width=True, key='fig1')
     else:
         st.info('Selecione mais de um bairro para ver o ranking.')
     
     # Gráfico 2: Média de Preço por Tamanho do Imóvel
     st.subheader('Média de Preço por Tamanho do Imóvel')
     
-    # Criar categorias de tamanho
-    df_filtered['Faixa de Tamanho'] = pd.cut(
-        df_filtered['Area'],
-        bins=[0, 50, 70, 90, 120, float('inf')],
-        labels=['Até 50m²', '51-70m²', '71-90m²', '91-120m²', 'Acima de 120m²']
-    )
-    
-    # Calcular médias
-    media_por_tamanho = df_filtered.groupby('Faixa de Tamanho')['Valor'].mean().reset_index()
-    
-    # Criar formatação personalizada para os textos das barras
-    text_values = [f'R$ {x:,.2f}'.replace('.', 'X').replace(',', '.').replace('X', ',') 
-                  for x in media_por_tamanho['Valor']]
-    
-    # Criar gráfico de barras horizontais
-    fig2 = px.bar(
-        media_por_tamanho,
-        x='Valor',
-        y='Faixa de Tamanho',
-        orientation='h',
-        text=text_values,
-        color='Faixa de Tamanho',
-        color_discrete_sequence=px.colors.sequential.Blues_r,
-        labels={'Valor': 'Média de Aluguel (R$)', 'Faixa de Tamanho': 'Tamanho do Imóvel'}
-    )
-    
-    # Melhorar formatação
-    fig2.update_layout(
-        showlegend=False,
-        yaxis_title='',
-        xaxis_title='Média de Aluguel',
-        height=400,
-        margin=dict(l=20, r=20, t=30, b=20)
-    )
-    
-    # Formatar eixo X no padrão monetário brasileiro
-    fig2.update_xaxes(
-        tickprefix='R$ ',
-        tickformat='.,2f',
-        ticktext=[f'R$ {x:,.2f}'.replace('.', 'X').replace(',', '.').replace('X', ',') 
-                 for x in fig2.data[0].x]
-    )
-    fig2.update_layout(
-        xaxis_title='Média de Aluguel'
-    )
+    # Só atualizar os dados da figura quando o conteúdo muda
+    chave = chave_conteudo(media_por_tamanho)
+    if chaves.get('fig2') != chave:
+        # Criar formatação personalizada para os textos das barras
+        text_values = [format_brl(x) for x in media_por_tamanho['Valor']]
+        
+        # Criar gráfico de barras horizontais
+        # (um único trace com uma cor por faixa, para poder atualizar os dados no lugar)
+        if 'fig2' not in figuras:
+            fig2 = px.bar(
+                media_por_tamanho,
+                x='Valor',
+                y='Faixa de Tamanho',
+                orientation='h',
+                text=text_values,
+                labels={'Valor': 'Média de Aluguel (R$)', 'Faixa de Tamanho': 'Tamanho do Imóvel'}
+            )
+            
+            # Melhorar formatação
+            fig2.update_layout(
+                showlegend=False,
+                yaxis_title='',
+                xaxis_title='Média de Aluguel',
+                height=400,
+                margin=dict(l=20, r=20, t=30, b=20)
+            )
+            
+            # Formatar eixo X no padrão monetário brasileiro
+            fig2.update_xaxes(
+                tickprefix='R$ ',
+                tickformat='.,2f'
+            )
+            figuras['fig2'] = fig2
+        
+        # Atualizar os dados das barras
+        fig2 = figuras['fig2']
+        fig2.update_traces(
+            x=media_por_tamanho['Valor'],
+            y=media_por_tamanho['Faixa de Tamanho'],
+            text=text_values,
+            marker_color=px.colors.sequential.Blues_r[:len(media_por_tamanho)]
+        )
+        fig2.update_xaxes(ticktext=text_values)
+        fig2.update_yaxes(categoryorder='array', categoryarray=media_por_tamanho['Faixa de Tamanho'][::-1])
+        
+        chaves['fig2'] = chave
     
-    st.plotly_chart(fig2, use_container_width=True)
+    st.plotly_chart(figuras['fig2'], use_container_width=True, key='fig2')
     
     # Adicionar tabela com contagem de imóveis por faixa
-    contagem_por_tamanho = df_filtered['Faixa de Tamanho'].value_counts().sort_index()
-    
     st.markdown('**Quantidade de imóveis por faixa de tamanho:**')
     st.dataframe(
         contagem_por_tamanho.rename('Quantidade de Imóveis'),
@@ -247,70 +384,96 @@ if not df_filtered.empty:
     # Gráfico 3: Distribuição de Preços (Simplificada)
     st.subheader('Distribuição de Preços')
     
-    # Criar faixas de preço
-    bins = [0, 1000, 2000, 3000, 4000, 5000, float('inf')]
-    labels = ['Até R$1.000', 'R$1.001-2.000', 'R$2.001-3.000', 'R$3.001-4.000', 'R$4.001-5.000', 'Acima de R$5.000']
-    
-    df_filtered['Faixa_Preco'] = pd.cut(df_filtered['Valor'], bins=bins, labels=labels)
-    contagem = df_filtered['Faixa_Preco'].value_counts().sort_index()
-    
-    fig3 = px.bar(
-        x=contagem.index,
-        y=contagem.values,
-        text=contagem.values,
-        color=contagem.index,
-        color_discrete_sequence=px.colors.sequential.Blues_r
-    )
-    
-    # Melhorar formatação
-    fig3.update_layout(
-        showlegend=False,
-        xaxis_title='Faixa de Preço',
-        yaxis_title='Número de Imóveis',
-        height=400
-    )
+    # Só atualizar os dados da figura quando o conteúdo muda
+    chave = chave_conteudo(contagem)
+    if chaves.get('fig3') != chave:
+        if 'fig3' not in figuras:
+            # Um único trace com uma cor por faixa, sem animação e sem o hovertemplate genérico do px
+            fig3 = px.bar(
+                x=contagem.index,
+                y=contagem.values,
+                text=contagem.values
+            )
+            fig3.update_traces(
+                marker_color=px.colors.sequential.Blues_r[:len(contagem)],
+                hovertemplate=None
+            )
+            
+            # Melhorar formatação
+            fig3.update_layout(
+                showlegend=False,
+                xaxis_title='Faixa de Preço',
+                yaxis_title='Número de Imóveis',
+                height=400,
+                transition_duration=0
+            )
+            figuras['fig3'] = fig3
+        
+        # Atualizar os dados das barras
+        fig3 = figuras['fig3']
+        fig3.update_traces(y=contagem.values, text=contagem.values)
+        
+        chaves['fig3'] = chave
     
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(figuras['fig3'], use_container_width=True, key='fig3')
     
     # Gráfico 4: Comparação com/sem Suíte (Simplificado)
     st.subheader('Média de Aluguel: Com vs Sem Suíte')
     
-    if 'Suites' in df_filtered.columns and len(df_filtered['Suites'].unique()) > 1:
-        # Calcular médias
-        media_com_suite = df_filtered[df_filtered['Suites'] == 1]['Valor'].mean()
-        media_sem_suite = df_filtered[df_filtered['Suites'] == 0]['Valor'].mean()
-        
-        # Criar DataFrame para o gráfico
-        dados = pd.DataFrame({
-            'Tipo': ['Com Suíte', 'Sem Suíte'],
-            'Média de Aluguel': [media_com_suite, media_sem_suite]
-        })
-        
-        fig4 = px.bar(
-            dados,
-            x='Tipo',
-            y='Média de Aluguel',
-            color='Tipo',
-            text_auto='.2f',
-            color_discrete_sequence=['#1f77b4', '#ff7f0e']
-        )
-        
-        # Melhorar formatação
-        fig4.update_layout(
-            showlegend=False,
-            xaxis_title='',
-            yaxis_title='Média de Aluguel (R$)',
-            height=400
-        )
+    if media_com_suite is not None:
+        # Só atualizar os dados da figura quando o conteúdo muda
+        chave = chave_conteudo((media_com_suite, media_sem_suite))
+        if chaves.get('fig4') != chave:
+            if 'fig4' not in figuras:
+                # Criar DataFrame para o gráfico
+                dados = pd.DataFrame({
+                    'Tipo': ['Com Suíte', 'Sem Suíte'],
+                    'Média de Aluguel': [media_com_suite, media_sem_suite]
+                })
+                
+                fig4 = px.bar(
+                    dados,
+                    x='Tipo',
+                    y='Média de Aluguel',
+                    color='Tipo',
+                    text_auto='.2f',
+                    color_discrete_sequence=['#1f77b4', '#ff7f0e']
+                )
+                
+                # Melhorar formatação
+                fig4.update_layout(
+                    showlegend=False,
+                    xaxis_title='',
+                    yaxis_title='Média de Aluguel (R$)',
+                    height=400
+                )
+                figuras['fig4'] = fig4
+            
+            # Atualizar os dados das barras (Com Suíte, Sem Suíte)
+            fig4 = figuras['fig4']
+            for trace, media in zip(fig4.data, (media_com_suite, media_sem_suite)):
+                trace.update(y=[media])
+            
+            chaves['fig4'] = chave
         
-        st.plotly_chart(fig4, use_container_width=True)
+        st.plotly_chart(figuras['fig4'], use_container_width=True, key='fig4')
     else:
         st.info('Selecione imóveis com e sem suíte para ver a comparação.')
     
-    # Tabela com os dados
+    # Tabela com os dados (paginada; só a página atual é enviada ao navegador)
     st.subheader('Dados Detalhados')
+    n_paginas = -(-total_ofertas // LINHAS_POR_PAGINA)
+    pagina = 1
+    if n_paginas > 1:
+        # O total de páginas no rótulo faz a página voltar a 1 quando o número de páginas muda
+        pagina = st.number_input(f'Página (de {n_paginas})', min_value=1, max_value=n_paginas, value=1, step=1)
+    inicio = (pagina - 1) * LINHAS_POR_PAGINA
+    df_detalhe = df.iloc[ordem[inicio:inicio + LINHAS_POR_PAGINA], df.columns.get_indexer(COLUNAS_DETALHE)]
+    if n_paginas > 1:
+        st.caption(f'Exibindo os imóveis {inicio + 1} a {inicio + len(df_detalhe)} de {total_ofertas}, '
+                   'do menor para o maior aluguel.')
     st.dataframe(
-        df_filtered[['Bairro', 'Quartos', 'Vagas', 'Area', 'Valor', 'Condominio', 'Valor_por_mes']].sort_values('Valor'),
+        df_detalhe,
         column_config={
             'Bairro': 'Bairro',
             'Quartos': 'Quartos',
@@ -320,14 +483,14 @@ if not df_filtered.empty:
             'Condominio': 'Condomínio (R$)',
             'Valor_por_mes': 'Custo Total (R$)'
         },
+        hide_index=True,
         use_container_width=True
     )
     
-    # Botão para baixar os dados filtrados
-    csv = df_filtered.to_csv(index=False, sep=';', decimal=',').encode('utf-8')
+    # Botão para baixar os dados filtrados (o CSV só é gerado no clique)
     st.download_button(
         label='Baixar Dados Filtrados (CSV)',
-        data=csv,
+        data=lambda: to_csv_bytes(filtros, linhas),
         file_name='dados_filtrados.csv',
         mime='text/csv'
     )